@@ -1,16 +1,23 @@
 """Shared components for Claude Parallel Hooks system."""
 
-from .models import (
-    Event,
-    EventType,
-    Task,
-    Plan,
-    Worker,
-    WorkerState
-)
+import importlib
 
-from .event_store import EventStore
-from .utils import generate_run_id, get_run_directory, ensure_directory
+# Public names are resolved on first access so that hooks importing a
+# single helper (e.g. shared.utils) do not pay for the models and stores
+_EXPORTS = {
+    'Event': '.models',
+    'EventType': '.models',
+    'Task': '.models',
+    'Plan': '.models',
+    'Worker': '.models',
+    'WorkerState': '.models',
+    'EventStore': '.event_store',
+    'generate_run_id': '.utils',
+    'get_run_directory': '.utils',
+    'get_active_run_id': '.utils',
+    'ensure_directory': '.utils',
+    'ensure_directories': '.utils'
+}
 
 __all__ = [
     'Event',
@@ -22,5 +29,19 @@ __all__ = [
     'EventStore',
     'generate_run_id',
     'get_run_directory',
-    'ensure_directory'
-]
\ No newline at end of file
+    'get_active_run_id',
+    'ensure_directory',
+    'ensure_directories'
+]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
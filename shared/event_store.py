@@ -4,192 +4,383 @@ import os
 import json
 import fcntl
 import platform
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional, Iterator
+from typing import Any, Dict, List, Optional, Iterator, Set
+from . import jsonio
 from .models import Event, EventType, Status, Worker, WorkerState
 
+# Bytes read per step when scanning the event log backwards
+TAIL_BLOCK_SIZE = 8192
+
 
 class EventStore:
     """Manages reading and writing to the events.jsonl file."""
 
-    def __init__(self, run_directory: str):
+    def __init__(self, run_directory: str, multi_process: bool = True):
         """Initialize the event store.
 
         Args:
             run_directory: Path to the run directory (e.g., .claude/runs/R42/)
+            multi_process: Whether other processes append to the same log;
+                if so, appends also take an exclusive flock on Unix
         """
         self.run_directory = Path(run_directory)
         self.events_file = self.run_directory / "events.jsonl"
         self.status_file = self.run_directory / "status.json"
+        self.status_line_file = self.run_directory / "status.txt"
+        self.complete_file = self.run_directory / "COMPLETE"
+        self.artifacts_index_file = self.run_directory / "artifacts.idx"
 
         # Ensure directory exists
         self.run_directory.mkdir(parents=True, exist_ok=True)
 
+        # Append descriptors, opened on first write and kept for the store's life
+        self._fd: Optional[int] = None
+        self._index_fd: Optional[int] = None
+        self._write_lock = threading.Lock()
+        self._use_flock = multi_process and platform.system() != 'Windows'
+
+        # Parsed events and the byte offset of the log they cover
+        self._offset = 0
+        self._events: List[Event] = []
+
+        # Status folded incrementally from self._events[:self._status_applied]
+        self._status_applied = 0
+        self._workers_map: Dict[str, Dict[str, Any]] = {}
+        self._tasks_done: Set[str] = set()
+        self._tasks_pending: Set[str] = set()
+
+        # Ready artifacts folded from self._events[:self._artifacts_applied]
+        self._artifacts_applied = 0
+        self._done_workers: Set[str] = set()
+        self._pending_artifacts: Dict[str, List[str]] = {}
+        self._ready_artifacts: List[str] = []
+
     def append_event(self, event: Event) -> None:
         """Append an event to the event log.
 
-        Thread-safe append operation using file locking on Unix.
-        On Windows, relies on atomic append behavior.
+        Each event is a single write() on an O_APPEND descriptor, serialized
+        within the process by a lock and across processes by flock on Unix
+        when multi_process is set.
 
         Args:
             event: Event to append
         """
-        # Ensure timestamp if not set
-        if not event.ts:
-            event.ts = datetime.now().isoformat()
+        self.append_events([event])
+
+    def append_events(self, events: List[Event]) -> None:
+        """Append several events to the event log in one write.
 
-        json_line = event.to_json() + '\n'
+        Used by producers that queue events and flush them in batches;
+        the whole batch lands contiguously in the log.
 
-        # Open in append mode for atomic writes
-        with open(self.events_file, 'a', encoding='utf-8') as f:
-            if platform.system() != 'Windows':
-                # Use file locking on Unix-like systems
+        Args:
+            events: Events to append, in order
+        """
+        if not events:
+            return
+
+        now = None
+        lines = []
+        index_lines = []
+        for event in events:
+            # Ensure timestamp if not set; formatting is left to readers
+            if not event.ts:
+                if now is None:
+                    now = time.time_ns()
+                event.ts = now
+            lines.append(event.to_json())
+            index_lines.extend(_index_lines(event))
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        index_data = ''.join(index_lines).encode('utf-8')
+
+        with self._write_lock:
+            self._open_descriptors()
+            if self._use_flock:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
                 try:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                    f.write(json_line)
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                except:
-                    # If locking fails, still write (append is usually atomic)
-                    f.write(json_line)
+                    self._write_all(self._fd, data)
+                    self._write_all(self._index_fd, index_data)
+                finally:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
             else:
-                # Windows: rely on atomic append
-                f.write(json_line)
+                self._write_all(self._fd, data)
+                self._write_all(self._index_fd, index_data)
+
+    def _open_descriptors(self) -> None:
+        """Open the event log and artifact index for appending, once.
+
+        A log written before the index existed gets its index backfilled
+        first, so the index always covers the whole log.
+        """
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        if self._fd is not None:
+            return
+
+        fd = os.open(self.events_file, flags, 0o644)
+        try:
+            if self._use_flock:
+                # Appenders write under this lock, so the log cannot grow
+                # between the backfill scan and the index appearing
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if not self.artifacts_index_file.exists():
+                    self._backfill_index()
+                index_fd = os.open(self.artifacts_index_file, flags, 0o644)
+            finally:
+                if self._use_flock:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd, self._index_fd = fd, index_fd
+
+    def _backfill_index(self) -> None:
+        """Build artifacts.idx from the artifact events already in the log."""
+        index_lines = []
+        with open(self.events_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    index_lines.extend(_index_lines(Event.from_json(line)))
+                except (ValueError, TypeError):
+                    # Malformed lines are skipped, as in read_events
+                    pass
+        self._write_atomic(self.artifacts_index_file, ''.join(index_lines))
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        """Write all of data, retrying after short writes."""
+        while data:
+            data = data[os.write(fd, data):]
+
+    def close(self) -> None:
+        """Close the append descriptors."""
+        with self._write_lock:
+            for name in ('_fd', '_index_fd'):
+                fd = getattr(self, name)
+                if fd is not None:
+                    os.close(fd)
+                    setattr(self, name, None)
+
+    def __del__(self):
+        for name in ('_fd', '_index_fd'):
+            fd = getattr(self, name, None)
+            if fd is not None:
+                os.close(fd)
 
     def read_events(self) -> List[Event]:
         """Read all events from the event log.
 
+        Only lines appended since the previous call are read and parsed;
+        earlier events come from the in-memory cache.
+
         Returns:
             List of all events in chronological order
         """
-        if not self.events_file.exists():
-            return []
+        self._read_new_events()
+        return list(self._events)
 
-        events = []
-        with open(self.events_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        events.append(Event.from_json(line))
-                    except json.JSONDecodeError:
-                        # Skip malformed lines
-                        pass
-        return events
+    def _read_new_events(self) -> None:
+        """Parse complete lines appended after the cached offset."""
+        try:
+            with open(self.events_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < self._offset:
+                    # Log was truncated or replaced; rebuild from scratch
+                    self._reset_cache()
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            if self._offset:
+                self._reset_cache()
+            return
+
+        # Leave a partially written trailing line for the next call
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return
+        self._offset += end
+
+        for line in data[:end].split(b'\n'):
+            line = line.strip()
+            if line:
+                try:
+                    self._events.append(Event.from_json(line))
+                except (ValueError, TypeError):
+                    # Skip malformed lines and unknown event types
+                    pass
+
+    def _reset_cache(self) -> None:
+        """Forget all cached events and folded status."""
+        self._offset = 0
+        self._events = []
+        self._status_applied = 0
+        self._workers_map = {}
+        self._tasks_done = set()
+        self._tasks_pending = set()
+        self._artifacts_applied = 0
+        self._done_workers = set()
+        self._pending_artifacts = {}
+        self._ready_artifacts = []
 
     def tail_events(self, last_n: int = 10) -> List[Event]:
         """Read the last N events from the log.
 
+        Reads fixed-size blocks backwards from the end of the file until
+        enough non-blank lines are found, so cost does not grow with the
+        log size.
+
         Args:
             last_n: Number of events to read from the end
 
         Returns:
             List of the last N events
         """
-        if not self.events_file.exists():
+        if last_n <= 0:
+            return []
+
+        try:
+            f = open(self.events_file, 'rb')
+        except FileNotFoundError:
             return []
 
-        # Read all lines (could optimize for large files)
-        with open(self.events_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            # Complete non-blank lines found so far, oldest first. Blank
+            # lines are dropped as each block is split, so they do not
+            # count toward last_n
+            lines: List[bytes] = []
+            # Bytes before the first newline read so far; may be the cut
+            # off tail of an earlier line until the start of the file
+            partial = b''
+            while pos > 0 and len(lines) < last_n:
+                read_size = min(TAIL_BLOCK_SIZE, pos)
+                pos -= read_size
+                f.seek(pos)
+                segments = (f.read(read_size) + partial).split(b'\n')
+                partial = segments[0]
+                lines[:0] = [line for line in segments[1:] if line.strip()]
+
+        if pos == 0 and partial.strip():
+            lines.insert(0, partial)
 
         events = []
         for line in lines[-last_n:]:
-            line = line.strip()
-            if line:
-                try:
-                    events.append(Event.from_json(line))
-                except json.JSONDecodeError:
-                    pass
+            try:
+                events.append(Event.from_json(line))
+            except (ValueError, TypeError):
+                pass
         return events
 
     def stream_events(self) -> Iterator[Event]:
         """Stream events as they are appended to the log.
 
+        Reads buffered bytes and hands each raw line to the JSON parser,
+        skipping the per-line text decoding of a text-mode file.
+
         Yields:
             Events as they appear in the log
         """
-        if not self.events_file.exists():
+        try:
+            f = open(self.events_file, 'rb')
+        except FileNotFoundError:
             return
 
-        with open(self.events_file, 'r', encoding='utf-8') as f:
+        with f:
             # Start from beginning
-            for line in f:
+            for line in iter(f.readline, b''):
                 line = line.strip()
                 if line:
                     try:
                         yield Event.from_json(line)
-                    except json.JSONDecodeError:
+                    except (ValueError, TypeError):
                         pass
 
     def compute_status(self) -> Status:
         """Compute current status from the event log.
 
+        Only events not yet folded into the cached status are applied.
+
         Returns:
             Current status of all workers and tasks
         """
-        events = self.read_events()
+        self._read_new_events()
+
+        for event in self._events[self._status_applied:]:
+            self._apply_to_status(event)
+        self._status_applied = len(self._events)
 
         # Extract run_id from directory name
         run_id = self.run_directory.name
 
-        # Track worker states
-        workers_map = {}
-        tasks_done = set()
-        tasks_pending = set()
-
-        for event in events:
-            if event.w:
-                if event.w not in workers_map:
-                    workers_map[event.w] = {
-                        'id': event.w,
-                        'state': 'init',
-                        'percent': 0,
-                        'last_msg': '',
-                        'task': event.task
-                    }
-
-                worker = workers_map[event.w]
-
-                if event.t == EventType.START:
-                    worker['state'] = 'running'
-                    worker['percent'] = 0
-                    if event.task:
-                        tasks_pending.add(event.task)
-
-                elif event.t == EventType.PROGRESS:
-                    if event.pct is not None:
-                        worker['percent'] = event.pct
-                    if event.msg:
-                        worker['last_msg'] = event.msg
-                    if 'waiting' in (event.msg or '').lower():
-                        worker['state'] = 'waiting'
-
-                elif event.t == EventType.ERROR:
-                    worker['state'] = 'error'
-                    if event.msg:
-                        worker['last_msg'] = event.msg
-
-                elif event.t == EventType.DONE:
-                    worker['state'] = 'done'
-                    worker['percent'] = 100
-                    if event.task:
-                        tasks_done.add(event.task)
-                        tasks_pending.discard(event.task)
-
         # Determine what we're blocked on
-        blocked_on = list(tasks_pending - tasks_done)
+        blocked_on = list(self._tasks_pending - self._tasks_done)
 
         # Check if merge is ready
-        merge_ready = len(tasks_pending) == 0 and len(tasks_done) > 0
+        merge_ready = len(self._tasks_pending) == 0 and len(self._tasks_done) > 0
 
         return Status(
             run_id=run_id,
-            workers=list(workers_map.values()),
+            workers=[dict(worker) for worker in self._workers_map.values()],
             blocked_on=blocked_on,
             merge_ready=merge_ready
         )
 
+    def _apply_to_status(self, event: Event) -> None:
+        """Fold one event into the cached worker and task state.
+
+        Args:
+            event: Next event in log order
+        """
+        if not event.w:
+            return
+
+        workers_map = self._workers_map
+        if event.w not in workers_map:
+            workers_map[event.w] = {
+                'id': event.w,
+                'state': 'init',
+                'percent': 0,
+                'last_msg': '',
+                'task': event.task
+            }
+
+        worker = workers_map[event.w]
+
+        if event.t == EventType.START:
+            # A START may carry the initial progress, saving separate
+            # progress events before any work is done
+            worker['state'] = 'running'
+            worker['percent'] = event.pct or 0
+            if event.msg:
+                worker['last_msg'] = event.msg
+            if event.task:
+                self._tasks_pending.add(event.task)
+
+        elif event.t == EventType.PROGRESS:
+            if event.pct is not None:
+                worker['percent'] = event.pct
+            if event.msg:
+                worker['last_msg'] = event.msg
+            if 'waiting' in (event.msg or '').lower():
+                worker['state'] = 'waiting'
+
+        elif event.t == EventType.ERROR:
+            worker['state'] = 'error'
+            if event.msg:
+                worker['last_msg'] = event.msg
+
+        elif event.t == EventType.DONE:
+            worker['state'] = 'done'
+            worker['percent'] = 100
+            if event.task:
+                self._tasks_done.add(event.task)
+                self._tasks_pending.discard(event.task)
+
     def save_status(self, status: Optional[Status] = None) -> None:
         """Save current status to status.json.
 
@@ -200,7 +391,8 @@ class EventStore:
             status = self.compute_status()
 
         with open(self.status_file, 'w', encoding='utf-8') as f:
-            json.dump(status.to_dict(), f, indent=2)
+            # One write call; json.dump writes once per encoded chunk
+            f.write(jsonio.dumps(status.to_dict(), indent=True))
 
     def load_status(self) -> Optional[Status]:
         """Load status from status.json if it exists.
@@ -212,25 +404,111 @@ class EventStore:
             return None
 
         try:
-            with open(self.status_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.status_file, 'rb') as f:
+                data = jsonio.loads(f.read())
                 return Status(**data)
         except (json.JSONDecodeError, TypeError):
             return None
 
+    def save_status_line(self, status: Optional[Status] = None) -> None:
+        """Save the compact status line to status.txt.
+
+        Written by the process that appends events so hooks can read the
+        line with a single file read instead of replaying the log. The
+        file is replaced atomically so readers never see a partial line.
+
+        Args:
+            status: Status to render (if None, computes current status)
+        """
+        if status is None:
+            status = self.compute_status()
+
+        self._write_atomic(self.status_line_file, status.to_compact_string())
+
+    def load_status_line(self) -> Optional[str]:
+        """Load the precomputed status line from status.txt.
+
+        Returns:
+            Status line or None if it has not been written yet
+        """
+        try:
+            return self.status_line_file.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+
+    def mark_complete(self, status: Optional[Status] = None) -> None:
+        """Write the COMPLETE sentinel with a summary of worker states.
+
+        Called once all workers reach a terminal state, so the Stop hook
+        can check for the file instead of polling the event log.
+
+        Args:
+            status: Status to summarize (if None, computes current status)
+        """
+        if status is None:
+            status = self.compute_status()
+
+        summary = {}
+        for worker in status.workers:
+            state = worker.get('state', 'unknown')
+            summary[state] = summary.get(state, 0) + 1
+
+        self._write_atomic(self.complete_file, jsonio.dumps(summary))
+
+    def load_completion(self) -> Optional[dict]:
+        """Load the summary from the COMPLETE sentinel.
+
+        Returns:
+            Worker state counts or None if the run is not complete
+        """
+        try:
+            with open(self.complete_file, 'rb') as f:
+                return jsonio.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            return {}
+
+    def _write_atomic(self, path: Path, text: str) -> None:
+        """Replace a file's contents so readers never see a partial write.
+
+        Args:
+            path: File to write
+            text: New contents
+        """
+        tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(text, encoding='utf-8')
+        os.replace(tmp_file, path)
+
     def get_worker_artifacts(self, worker_id: str) -> List[str]:
         """Get all artifacts produced by a worker.
 
+        Reads the artifacts.idx sidecar (one "worker<TAB>path" line per
+        artifact) instead of the full event log. Logs that have not been
+        appended to since before the index existed fall back to scanning
+        events; appending backfills the index.
+
         Args:
             worker_id: Worker ID to query
 
         Returns:
             List of artifact paths
         """
+        try:
+            with open(self.artifacts_index_file, 'r', encoding='utf-8') as f:
+                index = f.read()
+        except FileNotFoundError:
+            artifacts = []
+            for event in self.read_events():
+                if event.w == worker_id and event.t == EventType.ARTIFACT:
+                    artifacts.extend(event.artifact_paths)
+            return artifacts
+
         artifacts = []
-        for event in self.read_events():
-            if event.w == worker_id and event.t == EventType.ARTIFACT and event.path:
-                artifacts.append(event.path)
+        for line in index.splitlines():
+            w, _, path = line.partition('\t')
+            if w == worker_id and path:
+                artifacts.append(path)
         return artifacts
 
     def is_all_workers_done(self) -> bool:
@@ -245,22 +523,37 @@ class EventStore:
     def get_ready_artifacts(self) -> List[str]:
         """Get all artifacts from completed workers.
 
+        Single pass over new events: artifacts from a worker that is not
+        done yet are held back and released when its DONE event arrives.
+
         Returns:
             List of artifact paths from done workers
         """
-        done_workers = set()
-        artifacts = []
-
-        # First pass: identify done workers
-        for event in self.read_events():
-            if event.t == EventType.DONE and event.w:
+        self._read_new_events()
+
+        done_workers = self._done_workers
+        pending = self._pending_artifacts
+        ready = self._ready_artifacts
+
+        for event in self._events[self._artifacts_applied:]:
+            if not event.w:
+                continue
+            if event.t == EventType.ARTIFACT:
+                paths = event.artifact_paths
+                if event.w in done_workers:
+                    ready.extend(paths)
+                elif paths:
+                    pending.setdefault(event.w, []).extend(paths)
+            elif event.t == EventType.DONE:
                 done_workers.add(event.w)
+                ready.extend(pending.pop(event.w, []))
+        self._artifacts_applied = len(self._events)
+
+        return list(ready)
 
-        # Second pass: collect artifacts from done workers
-        for event in self.read_events():
-            if (event.t == EventType.ARTIFACT and
-                event.w in done_workers and
-                event.path):
-                artifacts.append(event.path)
 
-        return artifacts
\ No newline at end of file
+def _index_lines(event: Event) -> List[str]:
+    """artifacts.idx lines ("worker<TAB>path") for one event."""
+    if event.t != EventType.ARTIFACT or not event.w:
+        return []
+    return [f"{event.w}\t{path}\n" for path in event.artifact_paths]
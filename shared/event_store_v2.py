@@ -2,13 +2,163 @@
 
 import sqlite3
 import json
+import queue
+import functools
 import threading
-from datetime import datetime, timedelta
+import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple, Callable, Iterable, Union
 from contextlib import contextmanager
 from enum import Enum
 
+if TYPE_CHECKING:
+    # asyncio takes most of this module's import time; only aexecute
+    # needs it, so it is imported there
+    import asyncio
+
+# Size of each connection's prepared-statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Per-connection settings applied to every connection when it is opened
+_CONNECTION_PRAGMAS = (
+    ("busy_timeout", "5000"),        # wait up to 5s for a lock, not SQLITE_BUSY
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-64000"),        # 64 MB page cache
+    ("mmap_size", "268435456"),      # map up to 256 MB of the database
+)
+
+# Additional settings for connections that write. With synchronous=NORMAL
+# a power loss or OS crash can roll back the most recent commits, but the
+# database is never corrupted; an application crash loses nothing
+_WRITER_PRAGMAS = (
+    ("synchronous", "NORMAL"),       # in WAL mode, fsync only at checkpoints
+    ("wal_autocheckpoint", "1000"),
+    ("foreign_keys", "ON"),
+)
+
+# Applied while creating the schema of a new, empty database file
+_BULK_INIT_PRAGMAS = (
+    ("journal_mode", "OFF"),
+    ("synchronous", "OFF"),
+    ("foreign_keys", "OFF"),
+)
+
+# Payloads are stored as compact JSON text so json_extract() can query them
+_PAYLOAD_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+# Queued events are committed together once this many are waiting...
+FLUSH_BATCH_SIZE = 25
+# ...or once the oldest has waited this many seconds
+FLUSH_INTERVAL = 0.01
+
+# Rows per multi-row INSERT in append_events_batch; 7 parameters per row
+# keeps each statement under SQLite's historical 999 variable limit
+INSERT_BATCH_ROWS = 100
+
+# Seconds between background WAL checkpoints
+CHECKPOINT_INTERVAL = 30.0
+
+# Columns that older databases declared TEXT and that now hold epoch
+# seconds, with the indexes of their tables and the copy to upgrade them.
+# Unparseable values become 0, i.e. long expired / long silent
+_LEGACY_TIME_COLUMNS = (("blocks", "expires_at"), ("workers", "last_heartbeat"))
+
+_LEGACY_INDEXES = {
+    "blocks": ("idx_blocks_expires",),
+    "workers": ("idx_workers_state", "idx_workers_run_id"),
+}
+
+_LEGACY_COPY_SQL = {
+    # expires_at was written from datetime.now(), i.e. local time
+    "blocks": """
+        INSERT INTO blocks (
+            id, worker_id, hook_event, created_at, expires_at,
+            reason, retry_count, max_retries
+        )
+        SELECT
+            id, worker_id, hook_event, created_at,
+            CASE WHEN typeof(expires_at) = 'text' THEN COALESCE(
+                CAST(strftime('%s', expires_at, 'utc') AS INTEGER), 0
+            ) ELSE expires_at END,
+            reason, retry_count, max_retries
+        FROM blocks_legacy
+    """,
+    # last_heartbeat was CURRENT_TIMESTAMP, i.e. UTC
+    "workers": """
+        INSERT INTO workers (
+            id, run_id, task_id, state, pid, started_at,
+            last_heartbeat, progress, last_message
+        )
+        SELECT
+            id, run_id, task_id, state, pid, started_at,
+            CASE WHEN typeof(last_heartbeat) = 'text' THEN COALESCE(
+                CAST(strftime('%s', last_heartbeat) AS INTEGER), 0
+            ) ELSE last_heartbeat END,
+            progress, last_message
+        FROM workers_legacy
+    """,
+}
+
+_CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+# Hot queries are kept as module constants so every call passes the
+# identical SQL string and hits the connection's statement cache
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (
+        run_id, worker_id, event_type, task_id, payload, percent, message
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Unset (NULL) arguments keep the existing column value on update
+_UPSERT_WORKER_SQL = """
+    INSERT INTO workers (
+        id, run_id, state, progress, task_id,
+        last_message, started_at, last_heartbeat
+    ) VALUES (
+        :id, :run_id, COALESCE(:state, 'idle'), COALESCE(:progress, 0), :task_id,
+        :message, CURRENT_TIMESTAMP, :now
+    )
+    ON CONFLICT(id) DO UPDATE SET
+        last_heartbeat = :now,
+        state = COALESCE(:state, state),
+        progress = COALESCE(:progress, progress),
+        task_id = COALESCE(:task_id, task_id),
+        last_message = COALESCE(:message, last_message)
+"""
+
+# Filter columns of get_events, in bitmask order
+_GET_EVENTS_FILTERS = ('run_id', 'worker_id', 'task_id', 'event_type')
+
+# One fixed SQL string per filter combination, keyed by bitmask, so
+# repeated queries hit the statement cache. Columns are listed rather
+# than * to leave out the generated artifact_path
+_GET_EVENTS_SQL = tuple(
+    "SELECT id, timestamp, run_id, worker_id, event_type, task_id, payload,"
+    " percent, message FROM events WHERE 1=1"
+    + "".join(
+        f" AND {column} = ?"
+        for bit, column in enumerate(_GET_EVENTS_FILTERS)
+        if mask & (1 << bit)
+    )
+    + " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+    for mask in range(1 << len(_GET_EVENTS_FILTERS))
+)
+
+# Path of an artifact event, computed by SQLite from the payload. Only
+# artifact events with valid JSON are parsed, so other inserts stay cheap
+# and a malformed raw payload cannot fail the insert
+_ARTIFACT_PATH_EXPR = (
+    "CASE WHEN event_type = 'artifact' AND json_valid(payload) "
+    "THEN json_extract(payload, '$.path') END"
+)
+
+_TOUCH_HEARTBEAT_SQL = "UPDATE workers SET last_heartbeat = ? WHERE id = ?"
+
+_GET_WORKERS_SQL = """
+    SELECT id, task_id, state, progress, last_message
+    FROM workers WHERE run_id = ? ORDER BY id
+"""
+
 
 class EventType(Enum):
     """Types of events that workers can emit."""
@@ -36,48 +186,208 @@ class WorkerState(Enum):
 class EventStoreV2:
     """SQLite-based event store with ACID guarantees."""
 
-    def __init__(self, db_path: str = ".claude/state.db"):
+    def __init__(
+        self,
+        db_path: str = ".claude/state.db",
+        read_only: bool = False,
+        checkpoint_interval: Optional[float] = CHECKPOINT_INTERVAL,
+        connection: Optional[sqlite3.Connection] = None
+    ):
         """Initialize the event store with SQLite backend.
 
         Args:
             db_path: Path to SQLite database file
+            read_only: Open connections read-only (for hooks that only
+                query state); skips schema initialization. Writable
+                stores create the schema on first use
+            checkpoint_interval: Seconds between background WAL
+                checkpoints; None or 0 disables the checkpoint thread
+                and the checkpoint on close(), which suits short-lived
+                processes. Ignored for read-only stores
+            connection: Already open connection to db_path (e.g. handed
+                over by an orchestrator) to use on the calling thread
+                instead of opening a new one; it is switched to
+                autocommit and given the store's pragmas. Other threads
+                still open their own connections
         """
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
 
         # Thread-local storage for connections
         self._local = threading.local()
-
-        # Initialize schema
-        self.init_schema()
+        if connection is not None:
+            connection.isolation_level = None
+            self._local.conn = self._configure(connection)
+
+        # Single writer thread serving aexecute(), started on first use
+        self._writer_queue: queue.Queue = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+        # Background flusher serving enqueue_event(), started on first use
+        self._event_queue: queue.Queue = queue.Queue()
+        self._flusher_thread: Optional[threading.Thread] = None
+        self._flush_error: Optional[BaseException] = None
+        # Set by close() under _writer_lock; no flusher is started after it
+        self._closed = False
+
+        # monotonic time of the last heartbeat written per worker
+        self._heartbeats: Dict[str, float] = {}
+
+        # Background WAL checkpointer, stopped by close()
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoint_stop = threading.Event()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+
+        # Schema setup is deferred to the first connection use, so a
+        # process that never touches the store never opens the database
+        self._schema_lock = threading.RLock()
+        self._schema_ready = read_only
+        self._schema_initializing = False
 
     @property
     def conn(self) -> sqlite3.Connection:
-        """Get thread-local database connection."""
+        """Get thread-local database connection.
+
+        The first use on a writable store also creates the schema and
+        starts the checkpoint thread.
+        """
         if not hasattr(self._local, 'conn'):
-            self._local.conn = sqlite3.connect(
-                str(self.db_path),
-                isolation_level=None  # Autocommit mode
-            )
-            self._local.conn.row_factory = sqlite3.Row
-            # Enable foreign keys and JSON support
-            self._local.conn.execute("PRAGMA foreign_keys = ON")
+            if self.read_only:
+                conn = sqlite3.connect(
+                    f"{self.db_path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    isolation_level=None,
+                    cached_statements=STATEMENT_CACHE_SIZE
+                )
+            else:
+                if not self._schema_ready:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    str(self.db_path),
+                    isolation_level=None,  # Autocommit mode
+                    cached_statements=STATEMENT_CACHE_SIZE
+                )
+            self._local.conn = self._configure(conn)
+        if not self._schema_ready:
+            self._ensure_schema()
         return self._local.conn
 
+    def _ensure_schema(self):
+        """Create the schema and start the checkpoint thread, once."""
+        with self._schema_lock:
+            # init_schema itself goes through self.conn on this thread
+            if self._schema_ready or self._schema_initializing:
+                return
+            self._schema_initializing = True
+            try:
+                self.init_schema()
+            finally:
+                self._schema_initializing = False
+            self._schema_ready = True
+
+            if self._checkpoint_interval:
+                self._checkpoint_thread = threading.Thread(
+                    target=self._checkpoint_loop,
+                    args=(self._checkpoint_interval,),
+                    name=f"EventStoreV2-checkpoint:{self.db_path.name}",
+                    daemon=True
+                )
+                self._checkpoint_thread.start()
+
+    def _configure(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Apply the store's pragmas and row factory to a connection."""
+        if self.read_only:
+            # Never take the write lock from reader connections
+            pragmas = _CONNECTION_PRAGMAS + (("query_only", "ON"),)
+        else:
+            pragmas = _CONNECTION_PRAGMAS + _WRITER_PRAGMAS
+        for name, value in pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        conn.row_factory = sqlite3.Row
+        return conn
+
     @contextmanager
-    def transaction(self):
-        """Context manager for explicit transactions."""
-        self.conn.execute("BEGIN")
+    def transaction(self, immediate: bool = False):
+        """Context manager for explicit transactions.
+
+        Nested use joins the outer transaction, so several store calls
+        inside one block commit together.
+
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE)
+        """
+        conn = self.conn
+        depth = getattr(self._local, 'tx_depth', 0)
+        if depth:
+            self._local.tx_depth = depth + 1
+            try:
+                yield conn
+            finally:
+                self._local.tx_depth = depth
+            return
+
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        self._local.tx_depth = 1
         try:
-            yield self.conn
-            self.conn.execute("COMMIT")
+            yield conn
+            conn.execute("COMMIT")
         except Exception:
-            self.conn.execute("ROLLBACK")
+            conn.execute("ROLLBACK")
             raise
+        finally:
+            self._local.tx_depth = 0
+
+    def bulk(self):
+        """Group store writes into one transaction.
+
+        Example::
+
+            with store.bulk():
+                for task in tasks:
+                    store.append_event(EventType.START, run_id, task_id=task)
+
+        Returns:
+            Context manager yielding the connection
+        """
+        return self.transaction(immediate=True)
 
     def init_schema(self):
-        """Initialize database schema if not exists."""
-        with self.transaction() as conn:
+        """Initialize database schema if not exists.
+
+        A brand new database is built with journaling and fsyncs turned
+        off, since there is nothing to protect yet; if that is
+        interrupted, running init again completes the schema.
+        """
+        conn = self.conn
+        fresh = not conn.execute("SELECT count(*) FROM sqlite_master").fetchone()[0]
+        if fresh:
+            for name, value in _BULK_INIT_PRAGMAS:
+                conn.execute(f"PRAGMA {name} = {value}")
+        else:
+            # WAL is persistent in the database file, so set it once here
+            # rather than on every connection; readers then run alongside
+            # writers without blocking
+            conn.execute("PRAGMA journal_mode = WAL")
+
+        try:
+            self._create_schema()
+        finally:
+            if fresh:
+                conn.execute("PRAGMA journal_mode = WAL")
+                for name, value in _WRITER_PRAGMAS:
+                    conn.execute(f"PRAGMA {name} = {value}")
+
+    def _create_schema(self):
+        """Create tables and indexes in one transaction.
+
+        The write lock is taken up front: the legacy check reads the
+        schema first, and a deferred transaction that then writes cannot
+        wait for another process's lock, it fails with SQLITE_BUSY.
+        """
+        with self.transaction(immediate=True) as conn:
+            legacy = _detach_legacy_tables(conn)
+
             # Events table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS events (
@@ -87,25 +397,52 @@ class EventStoreV2:
                     worker_id TEXT,
                     event_type TEXT NOT NULL,
                     task_id TEXT,
-                    payload JSON
+                    payload JSON,
+                    percent INTEGER,
+                    message TEXT,
+                    artifact_path TEXT GENERATED ALWAYS AS (%s) VIRTUAL
+                )
+            """ % _ARTIFACT_PATH_EXPR)
+
+            # Databases created before these columns existed gain them here
+            columns = {
+                row['name'] for row in conn.execute("PRAGMA table_xinfo(events)")
+            }
+            if 'percent' not in columns:
+                conn.execute("ALTER TABLE events ADD COLUMN percent INTEGER")
+                conn.execute("ALTER TABLE events ADD COLUMN message TEXT")
+            if 'artifact_path' not in columns:
+                conn.execute(
+                    "ALTER TABLE events ADD COLUMN artifact_path TEXT "
+                    "GENERATED ALWAYS AS (%s) VIRTUAL" % _ARTIFACT_PATH_EXPR
                 )
-            """)
 
-            # Indexes for events
+            # Indexes for events; the composite indexes match get_events'
+            # ORDER BY so the newest rows come straight off the index
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_run_ts
+                ON events(run_id, timestamp DESC, id DESC)
+            """)
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_events_run_id
-                ON events(run_id)
+                CREATE INDEX IF NOT EXISTS idx_events_type_run_ts
+                ON events(event_type, run_id, timestamp DESC, id DESC)
             """)
+            # Superseded by the composite indexes above
+            conn.execute("DROP INDEX IF EXISTS idx_events_run_id")
+            conn.execute("DROP INDEX IF EXISTS idx_events_timestamp")
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_events_timestamp
-                ON events(timestamp)
+                CREATE INDEX IF NOT EXISTS idx_events_artifact_path
+                ON events(run_id, event_type, artifact_path)
+                WHERE artifact_path IS NOT NULL
             """)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_events_worker_task
                 ON events(worker_id, task_id)
             """)
 
-            # Workers table
+            # Workers table; WITHOUT ROWID stores each row in the primary
+            # key B-tree, so a status update touches one page instead of
+            # the key index plus the rowid table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS workers (
                     id TEXT PRIMARY KEY,
@@ -114,10 +451,10 @@ class EventStoreV2:
                     state TEXT NOT NULL DEFAULT 'idle',
                     pid INTEGER,
                     started_at TEXT,
-                    last_heartbeat TEXT,
+                    last_heartbeat INTEGER,
                     progress INTEGER DEFAULT 0,
                     last_message TEXT
-                )
+                ) WITHOUT ROWID
             """)
 
             # Indexes for workers
@@ -152,9 +489,10 @@ class EventStoreV2:
                 ON tasks(state)
             """)
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_tasks_run_id
-                ON tasks(run_id)
+                CREATE INDEX IF NOT EXISTS idx_tasks_run_state
+                ON tasks(run_id, state)
             """)
+            conn.execute("DROP INDEX IF EXISTS idx_tasks_run_id")
 
             # Blocks table for managing blocking operations
             conn.execute("""
@@ -163,7 +501,7 @@ class EventStoreV2:
                     worker_id TEXT NOT NULL,
                     hook_event TEXT NOT NULL,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TEXT NOT NULL,
+                    expires_at INTEGER NOT NULL,
                     reason TEXT,
                     retry_count INTEGER DEFAULT 0,
                     max_retries INTEGER DEFAULT 3
@@ -187,39 +525,243 @@ class EventStoreV2:
                 )
             """)
 
+            if legacy:
+                _copy_legacy_tables(conn, legacy)
+
+            # Gather planner statistics once, when the database is new
+            has_stats = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if not has_stats:
+                conn.execute("ANALYZE")
+
     def append_event(
         self,
         event_type: EventType,
         run_id: str,
         worker_id: Optional[str] = None,
         task_id: Optional[str] = None,
-        payload: Optional[Dict[str, Any]] = None
+        payload: Optional[Dict[str, Any]] = None,
+        percent: Optional[int] = None,
+        message: Optional[str] = None
     ) -> int:
         """Atomically append an event.
 
+        Progress and heartbeat events should pass percent and message as
+        arguments rather than in the payload; they are stored in their
+        own columns and need no JSON encoding.
+
         Args:
             event_type: Type of event
             run_id: Run identifier
             worker_id: Worker identifier (optional)
             task_id: Task identifier (optional)
             payload: Arbitrary JSON payload (optional)
+            percent: Progress percentage (optional)
+            message: Status message (optional)
 
         Returns:
             Event ID
         """
         with self.transaction() as conn:
-            cursor = conn.execute("""
-                INSERT INTO events (run_id, worker_id, event_type, task_id, payload)
-                VALUES (?, ?, ?, ?, json(?))
-            """, (
+            cursor = conn.execute(_INSERT_EVENT_SQL, (
                 run_id,
                 worker_id,
                 event_type.value,
                 task_id,
-                json.dumps(payload) if payload else None
+                _encode_payload(payload),
+                percent,
+                message
             ))
             return cursor.lastrowid
 
+    def append_event_raw(
+        self,
+        event_type: EventType,
+        run_id: str,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        payload_json: Optional[Union[str, bytes]] = None
+    ) -> int:
+        """Append an event whose payload is already JSON-encoded.
+
+        Lets callers that received JSON (e.g. hook stdin) store it without
+        a decode/encode round trip. The payload is not validated; it must
+        be a JSON object for json_extract() based queries to see it.
+
+        Args:
+            event_type: Type of event
+            run_id: Run identifier
+            worker_id: Worker identifier (optional)
+            task_id: Task identifier (optional)
+            payload_json: Encoded JSON payload as str or UTF-8 bytes
+
+        Returns:
+            Event ID
+        """
+        if isinstance(payload_json, bytes):
+            # Bind as TEXT; a BLOB would be rejected by json_extract()
+            payload_json = payload_json.decode('utf-8')
+
+        with self.transaction() as conn:
+            cursor = conn.execute(_INSERT_EVENT_SQL, (
+                run_id,
+                worker_id,
+                event_type.value,
+                task_id,
+                payload_json or None,
+                None,
+                None
+            ))
+            return cursor.lastrowid
+
+    def append_events_batch(
+        self,
+        events: Iterable[Tuple[Any, ...]]
+    ) -> None:
+        """Append several events in a single transaction.
+
+        Args:
+            events: (event_type, run_id, worker_id, task_id, payload)
+                tuples, optionally followed by percent and message, in
+                the same order as append_event's arguments
+        """
+        rows = []
+        for event in events:
+            event_type, run_id, worker_id, task_id, payload = event[:5]
+            percent, message = event[5:] or (None, None)
+            rows.append((
+                run_id,
+                worker_id,
+                event_type.value,
+                task_id,
+                _encode_payload(payload),
+                percent,
+                message
+            ))
+        self._insert_rows(rows)
+
+    def _insert_rows(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Insert encoded event rows in a single transaction.
+
+        Args:
+            rows: Parameter tuples in _insert_events_sql column order
+        """
+        if not rows:
+            return
+
+        # One multi-row INSERT per chunk instead of a statement per row
+        with self.transaction(immediate=True) as conn:
+            for start in range(0, len(rows), INSERT_BATCH_ROWS):
+                chunk = rows[start:start + INSERT_BATCH_ROWS]
+                conn.execute(
+                    _insert_events_sql(len(chunk)),
+                    [value for row in chunk for value in row]
+                )
+
+    def enqueue_event(
+        self,
+        event_type: EventType,
+        run_id: str,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        percent: Optional[int] = None,
+        message: Optional[str] = None
+    ):
+        """Queue an event for a background batched commit.
+
+        Unlike append_event this returns immediately without an event ID.
+        Queued events are committed in batches of up to FLUSH_BATCH_SIZE,
+        or after FLUSH_INTERVAL seconds. Call flush() to wait for them.
+        The payload is encoded here, so an unserializable payload raises
+        in the caller and never reaches the queue. After close() the
+        event is committed synchronously instead.
+
+        Args:
+            event_type: Type of event
+            run_id: Run identifier
+            worker_id: Worker identifier (optional)
+            task_id: Task identifier (optional)
+            payload: Arbitrary JSON payload (optional)
+            percent: Progress percentage (optional)
+            message: Status message (optional)
+
+        Raises:
+            TypeError: If payload is not JSON serializable
+        """
+        row = (
+            run_id, worker_id, event_type.value, task_id,
+            _encode_payload(payload), percent, message
+        )
+        # Queue under the lock, so every queued row is ahead of the
+        # sentinel close() sends to the flusher
+        with self._writer_lock:
+            if not self._closed:
+                self._start_flusher()
+                self._event_queue.put(row)
+                return
+        self._insert_rows([row])
+
+    def flush(self):
+        """Wait until all queued events are committed.
+
+        Raises:
+            Exception: The last error hit by the background flusher
+        """
+        if self._flusher_thread is not None:
+            self._event_queue.join()
+        error, self._flush_error = self._flush_error, None
+        if error is not None:
+            raise error
+
+    def _start_flusher(self):
+        """Start the background flusher if it is not running.
+
+        The caller must hold _writer_lock.
+        """
+        if self._flusher_thread is None:
+            self._flusher_thread = threading.Thread(
+                target=self._flusher_loop,
+                name=f"EventStoreV2-flusher:{self.db_path.name}",
+                daemon=True
+            )
+            self._flusher_thread.start()
+
+    def _flusher_loop(self):
+        """Commit queued events in batches until a None sentinel arrives."""
+        stop = False
+        while not stop:
+            item = self._event_queue.get()
+            if item is None:
+                self._event_queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < FLUSH_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._event_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self._insert_rows(batch)
+            except Exception as exc:
+                self._flush_error = exc
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._event_queue.task_done()
+
+        self._close_local()
+
     def get_events(
         self,
         run_id: Optional[str] = None,
@@ -242,26 +784,24 @@ class EventStoreV2:
         Returns:
             List of event dictionaries
         """
-        query = "SELECT * FROM events WHERE 1=1"
-        params = []
-
+        mask = 0
+        params = ()
         if run_id:
-            query += " AND run_id = ?"
-            params.append(run_id)
+            mask |= 1
+            params += (run_id,)
         if worker_id:
-            query += " AND worker_id = ?"
-            params.append(worker_id)
+            mask |= 2
+            params += (worker_id,)
         if task_id:
-            query += " AND task_id = ?"
-            params.append(task_id)
+            mask |= 4
+            params += (task_id,)
         if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type.value)
-
-        query += " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+            mask |= 8
+            params += (event_type.value,)
 
-        cursor = self.conn.execute(query, params)
+        cursor = self.conn.execute(
+            _GET_EVENTS_SQL[mask], params + (limit, offset)
+        )
         return [dict(row) for row in cursor.fetchall()]
 
     def update_worker_status(
@@ -283,52 +823,128 @@ class EventStoreV2:
             task_id: Assigned task ID
             message: Status message
         """
-        with self.transaction() as conn:
-            # Check if worker exists
-            cursor = conn.execute(
-                "SELECT id FROM workers WHERE id = ?",
-                (worker_id,)
+        self.conn.execute(_UPSERT_WORKER_SQL, {
+            'id': worker_id,
+            'run_id': run_id,
+            'state': state.value if state else None,
+            'progress': progress,
+            'task_id': task_id,
+            'message': message,
+            'now': int(time.time())
+        })
+        self._heartbeats[worker_id] = time.monotonic()
+
+    def finalize_worker(
+        self,
+        worker_id: str,
+        run_id: str,
+        task_id: Optional[str] = None,
+        success: bool = True,
+        artifacts: Iterable[str] = (),
+        message: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record the end of a worker's task in one transaction.
+
+        Appends one ARTIFACT event per path, then a DONE or ERROR event,
+        and sets the worker's terminal state, all in a single commit.
+
+        Args:
+            worker_id: Worker identifier
+            run_id: Run identifier
+            task_id: Task identifier (optional)
+            success: Whether the task completed; selects DONE or ERROR
+            artifacts: Paths produced by the task
+            message: Final status message
+            error: Error description, stored in the ERROR event payload
+        """
+        events = [
+            (EventType.ARTIFACT, run_id, worker_id, task_id, {'path': path})
+            for path in artifacts
+        ]
+        if success:
+            events.append((EventType.DONE, run_id, worker_id, task_id, None))
+            state, progress = WorkerState.DONE, 100
+        else:
+            events.append((
+                EventType.ERROR, run_id, worker_id, task_id,
+                {'error': error} if error else None
+            ))
+            state, progress = WorkerState.ERROR, None
+
+        with self.transaction(immediate=True):
+            self.append_events_batch(events)
+            self.update_worker_status(
+                worker_id, run_id, state, progress, task_id, message
             )
-            exists = cursor.fetchone() is not None
-
-            if exists:
-                # Update existing worker
-                updates = ["last_heartbeat = CURRENT_TIMESTAMP"]
-                params = []
-
-                if state:
-                    updates.append("state = ?")
-                    params.append(state.value)
-                if progress is not None:
-                    updates.append("progress = ?")
-                    params.append(progress)
-                if task_id is not None:
-                    updates.append("task_id = ?")
-                    params.append(task_id)
-                if message is not None:
-                    updates.append("last_message = ?")
-                    params.append(message)
-
-                params.append(worker_id)
-                conn.execute(
-                    f"UPDATE workers SET {', '.join(updates)} WHERE id = ?",
-                    params
-                )
-            else:
-                # Insert new worker
-                conn.execute("""
-                    INSERT INTO workers (
-                        id, run_id, state, progress, task_id,
-                        last_message, started_at, last_heartbeat
-                    ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                """, (
-                    worker_id,
-                    run_id,
-                    state.value if state else WorkerState.IDLE.value,
-                    progress or 0,
-                    task_id,
-                    message
-                ))
+
+    def touch_heartbeat(self, worker_id: str, min_interval: float = 0.0) -> bool:
+        """Record that a worker is alive without appending an event.
+
+        A single UPDATE of last_heartbeat, which is all detect_dead_workers
+        reads. Any status update through this store also counts as a
+        heartbeat.
+
+        Args:
+            worker_id: Worker identifier
+            min_interval: Skip the write if this worker's heartbeat was
+                written through this store less than this many seconds ago
+
+        Returns:
+            True if the heartbeat was written, False if skipped or the
+            worker is unknown
+        """
+        now = time.monotonic()
+        last = self._heartbeats.get(worker_id)
+        if last is not None and now - last < min_interval:
+            return False
+        cursor = self.conn.execute(
+            _TOUCH_HEARTBEAT_SQL, (int(time.time()), worker_id)
+        )
+        if not cursor.rowcount:
+            return False
+        self._heartbeats[worker_id] = now
+        return True
+
+    def append_event_and_update_status(
+        self,
+        event_type: EventType,
+        run_id: str,
+        worker_id: str,
+        task_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        state: Optional[WorkerState] = None,
+        progress: Optional[int] = None,
+        message: Optional[str] = None
+    ) -> int:
+        """Append a worker event and update the worker's status together.
+
+        Both rows are written in one immediate transaction, so a progress
+        or heartbeat report costs one commit instead of two. progress and
+        message are also stored on the event's own columns.
+
+        Args:
+            event_type: Type of event
+            run_id: Run identifier
+            worker_id: Worker identifier
+            task_id: Task identifier (optional); also assigned to the worker
+            payload: Arbitrary JSON payload (optional)
+            state: New worker state
+            progress: Progress percentage (0-100)
+            message: Status message
+
+        Returns:
+            Event ID
+        """
+        with self.transaction(immediate=True):
+            event_id = self.append_event(
+                event_type, run_id, worker_id, task_id, payload,
+                progress, message
+            )
+            self.update_worker_status(
+                worker_id, run_id, state, progress, task_id, message
+            )
+            return event_id
 
     def get_worker_status(self, worker_id: str) -> Optional[Dict[str, Any]]:
         """Get current worker status.
@@ -361,6 +977,22 @@ class EventStoreV2:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_workers(self, run_id: str) -> List[Tuple[str, Optional[str], str, int, Optional[str]]]:
+        """Get compact worker rows for a run.
+
+        Rows are plain tuples rather than dicts, for status formatting on
+        the hook hot path.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            List of (id, task_id, state, progress, last_message) tuples
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(_GET_WORKERS_SQL, (run_id,)).fetchall()
+
     def detect_dead_workers(self, timeout_seconds: int = 60) -> List[Dict[str, Any]]:
         """Detect workers that haven't sent heartbeat recently.
 
@@ -373,8 +1005,8 @@ class EventStoreV2:
         cursor = self.conn.execute("""
             SELECT * FROM workers
             WHERE state IN ('busy', 'blocked')
-            AND datetime(last_heartbeat) < datetime('now', ? || ' seconds')
-        """, (f'-{timeout_seconds}',))
+            AND last_heartbeat < ?
+        """, (int(time.time()) - timeout_seconds,))
 
         return [dict(row) for row in cursor.fetchall()]
 
@@ -399,6 +1031,10 @@ class EventStoreV2:
             True if block created, False if retry limit exceeded
         """
         with self.transaction() as conn:
+            # Expired blocks no longer count toward retries; this write
+            # path is where they get pruned now that reads don't delete
+            self.cleanup_expired_blocks()
+
             # Check current retry count
             cursor = conn.execute("""
                 SELECT retry_count FROM blocks
@@ -413,9 +1049,7 @@ class EventStoreV2:
                 return False
 
             # Create new block
-            expires_at = (
-                datetime.now() + timedelta(seconds=duration_seconds)
-            ).isoformat()
+            expires_at = int(time.time()) + duration_seconds
 
             conn.execute("""
                 INSERT INTO blocks (
@@ -429,26 +1063,33 @@ class EventStoreV2:
 
             return True
 
-    def get_active_blocks(self, hook_event: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_active_blocks(
+        self,
+        hook_event: Optional[str] = None,
+        cleanup: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get currently active blocks.
 
+        Expired rows are filtered out rather than deleted, so this stays a
+        pure read unless cleanup is requested.
+
         Args:
             hook_event: Filter by hook event type
+            cleanup: Also delete expired blocks first
 
         Returns:
             List of active blocks
         """
-        # Clean expired blocks first
-        self.conn.execute("""
-            DELETE FROM blocks
-            WHERE datetime(expires_at) < datetime('now')
-        """)
+        now = int(time.time())
+
+        if cleanup:
+            self.cleanup_expired_blocks(now)
 
         query = """
             SELECT * FROM blocks
-            WHERE datetime(expires_at) > datetime('now')
+            WHERE expires_at > ?
         """
-        params = []
+        params = [now]
 
         if hook_event:
             query += " AND hook_event = ?"
@@ -457,6 +1098,22 @@ class EventStoreV2:
         cursor = self.conn.execute(query, params)
         return [dict(row) for row in cursor.fetchall()]
 
+    def cleanup_expired_blocks(self, now: Optional[int] = None) -> int:
+        """Delete expired blocks.
+
+        Args:
+            now: Current unix time (defaults to time.time())
+
+        Returns:
+            Number of blocks deleted
+        """
+        if now is None:
+            now = int(time.time())
+        cursor = self.conn.execute(
+            "DELETE FROM blocks WHERE expires_at < ?", (now,)
+        )
+        return cursor.rowcount
+
     def get_ready_artifacts(self, run_id: str) -> List[str]:
         """Get artifacts from completed tasks.
 
@@ -467,19 +1124,246 @@ class EventStoreV2:
             List of artifact paths
         """
         cursor = self.conn.execute("""
-            SELECT DISTINCT json_extract(e.payload, '$.path') as path
+            SELECT DISTINCT e.artifact_path AS path
             FROM events e
             JOIN tasks t ON e.task_id = t.id
             WHERE e.event_type = 'artifact'
             AND t.state = 'completed'
             AND e.run_id = ?
-            AND json_extract(e.payload, '$.path') IS NOT NULL
+            AND e.artifact_path IS NOT NULL
         """, (run_id,))
 
         return [row['path'] for row in cursor.fetchall()]
 
-    def close(self):
-        """Close database connection."""
+    def get_ready_artifacts_for_run(self, run_id: str) -> List[str]:
+        """Get artifacts from all done workers of a run in one query.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            List of artifact paths
+        """
+        cursor = self.conn.execute("""
+            SELECT DISTINCT e.artifact_path AS path
+            FROM events e
+            JOIN workers w ON e.worker_id = w.id
+            WHERE w.run_id = ?
+            AND w.state = 'done'
+            AND e.run_id = w.run_id
+            AND e.event_type = 'artifact'
+            AND e.artifact_path IS NOT NULL
+        """, (run_id,))
+
+        return [row['path'] for row in cursor.fetchall()]
+
+    async def aexecute(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a store call on the dedicated writer thread.
+
+        Async producers (the orchestrator) queue calls such as
+        ``await store.aexecute(store.append_event, EventType.DONE, run_id)``
+        without blocking the event loop. All queued calls share one
+        connection and run in submission order. After close() the call
+        runs directly on the calling thread instead.
+
+        Args:
+            fn: Store method (or any callable) to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Whatever fn returns
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        call = functools.partial(fn, *args, **kwargs)
+        # As in enqueue_event, queue ahead of close()'s sentinel or not at all
+        with self._writer_lock:
+            closed = self._closed
+            if not closed:
+                self._start_writer()
+                self._writer_queue.put((loop, future, call))
+        if closed:
+            return call()
+        return await future
+
+    def _start_writer(self):
+        """Start the writer thread if it is not running.
+
+        The caller must hold _writer_lock.
+        """
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop,
+                name=f"EventStoreV2-writer:{self.db_path.name}",
+                daemon=True
+            )
+            self._writer_thread.start()
+
+    def _writer_loop(self):
+        """Execute queued calls and resolve their futures on the caller's loop."""
+        while True:
+            item = self._writer_queue.get()
+            if item is None:
+                break
+
+            loop, future, call = item
+            try:
+                result = call()
+            except BaseException as exc:
+                resolve, value = _set_future_exception, exc
+            else:
+                resolve, value = _set_future_result, result
+
+            try:
+                loop.call_soon_threadsafe(resolve, future, value)
+            except RuntimeError:
+                # Caller's event loop already closed; nobody is waiting
+                pass
+
+        self._close_local()
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+        """Copy WAL frames back into the database file.
+
+        PASSIVE never waits: it copies what it can without blocking
+        readers or writers. TRUNCATE also resets the WAL to zero bytes,
+        but waits on the busy handler for readers and holds up new
+        writers meanwhile, so only use it when the store is idle.
+
+        Args:
+            mode: PASSIVE, FULL, RESTART or TRUNCATE
+
+        Returns:
+            (busy, wal_frames, checkpointed_frames) as reported by
+            PRAGMA wal_checkpoint; busy is 1 if readers or a writer
+            prevented a full checkpoint
+        """
+        if mode not in _CHECKPOINT_MODES:
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+        return tuple(
+            self.conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        )
+
+    def _checkpoint_loop(self, interval: float):
+        """Checkpoint the WAL every interval seconds until close().
+
+        Each round runs a PASSIVE checkpoint. Only when that copied the
+        whole WAL, meaning no reader or writer is active, is the WAL
+        truncated, and then without waiting on the busy handler.
+        """
+        try:
+            # Never wait for locks from this thread
+            self.conn.execute("PRAGMA busy_timeout = 0")
+            while not self._checkpoint_stop.wait(interval):
+                try:
+                    busy, wal_frames, copied = self.checkpoint()
+                    if not busy and wal_frames and copied == wal_frames:
+                        self.checkpoint("TRUNCATE")
+                except sqlite3.Error:
+                    # Busy or locked; the next round will catch up
+                    pass
+        finally:
+            self._close_local()
+
+    def _close_local(self):
+        """Close the calling thread's connection."""
         if hasattr(self._local, 'conn'):
             self._local.conn.close()
-            delattr(self._local, 'conn')
\ No newline at end of file
+            delattr(self._local, 'conn')
+
+    def close(self):
+        """Close database connection.
+
+        Also drains and stops the writer thread and event flusher if
+        aexecute() or enqueue_event() started them. Stores with a
+        checkpoint thread stop it and run a final PASSIVE checkpoint.
+        Events enqueued after this point are committed synchronously.
+        """
+        with self._writer_lock:
+            self._closed = True
+            writer, self._writer_thread = self._writer_thread, None
+            flusher, self._flusher_thread = self._flusher_thread, None
+            checkpointer, self._checkpoint_thread = self._checkpoint_thread, None
+        if flusher is not None:
+            self._event_queue.put(None)
+            flusher.join()
+        if writer is not None:
+            self._writer_queue.put(None)
+            writer.join()
+        if checkpointer is not None:
+            self._checkpoint_stop.set()
+            checkpointer.join()
+        if not self.read_only and hasattr(self._local, 'conn'):
+            # Refresh planner statistics if they have drifted
+            self._local.conn.execute("PRAGMA optimize")
+            if self._checkpoint_interval:
+                # Copy back what the WAL holds without waiting on readers
+                try:
+                    self.checkpoint()
+                except sqlite3.Error:
+                    pass
+        self._close_local()
+
+
+def _detach_legacy_tables(conn: sqlite3.Connection) -> List[str]:
+    """Move aside tables that still store times as ISO text.
+
+    Older databases declared blocks.expires_at and workers.last_heartbeat
+    TEXT. Integers written to a TEXT column are stored as text, which
+    SQLite sorts above every integer, so those tables are renamed here,
+    recreated by _create_schema and refilled by _copy_legacy_tables.
+
+    Returns:
+        Names of the tables that were moved aside
+    """
+    legacy = []
+    for table, column in _LEGACY_TIME_COLUMNS:
+        types = {
+            row['name']: row['type'].upper()
+            for row in conn.execute(f"PRAGMA table_info({table})").fetchall()
+        }
+        if types.get(column) != 'TEXT':
+            continue
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        # Free the index names for the recreated table
+        for index in _LEGACY_INDEXES[table]:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+        legacy.append(table)
+    return legacy
+
+
+def _copy_legacy_tables(conn: sqlite3.Connection, tables: List[str]):
+    """Copy rows from moved-aside tables, converting times to epoch seconds."""
+    for table in tables:
+        conn.execute(_LEGACY_COPY_SQL[table])
+        conn.execute(f"DROP TABLE {table}_legacy")
+
+
+@functools.lru_cache(maxsize=None)
+def _insert_events_sql(row_count: int) -> str:
+    """Build the INSERT statement for row_count events."""
+    return (
+        "INSERT INTO events (run_id, worker_id, event_type, task_id, payload, "
+        "percent, message) VALUES "
+        + ", ".join(["(?, ?, ?, ?, ?, ?, ?)"] * row_count)
+    )
+
+
+def _encode_payload(payload: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Encode an event payload as compact JSON, or None if empty."""
+    return _PAYLOAD_ENCODER.encode(payload) if payload else None
+
+
+def _set_future_result(future: 'asyncio.Future', result: Any):
+    """Resolve a future unless the awaiting task was cancelled."""
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future: 'asyncio.Future', exc: BaseException):
+    """Fail a future unless the awaiting task was cancelled."""
+    if not future.done():
+        future.set_exception(exc)
\ No newline at end of file
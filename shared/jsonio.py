@@ -0,0 +1,79 @@
+"""JSON encoding and decoding, using orjson when it is installed.
+
+orjson is an optional speedup (the ``fast`` extra); everything falls
+back to the stdlib json module. Values orjson rejects, such as integers
+above 64 bits, are encoded by the stdlib instead. The two backends still
+differ beyond plain JSON types:
+
+- orjson encodes datetime, UUID, Enum and dataclass values, which the
+  stdlib rejects with TypeError; callers must convert them first
+- orjson decodes integers above 64 bits as floats, where the stdlib
+  keeps them exact
+"""
+
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Encode obj as a JSON string.
+
+    Args:
+        obj: Value to encode
+        indent: Indent by two spaces instead of the compact form
+
+    Returns:
+        Encoded JSON
+    """
+    data = _orjson_dumps(obj, indent)
+    if data is not None:
+        return data.decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON bytes.
+
+    Args:
+        obj: Value to encode
+        indent: Indent by two spaces instead of the compact form
+
+    Returns:
+        Encoded JSON
+    """
+    data = _orjson_dumps(obj, indent)
+    if data is not None:
+        return data
+    return dumps(obj, indent).encode('utf-8')
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON from a string or UTF-8 bytes.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _orjson_dumps(obj: Any, indent: bool) -> Optional[bytes]:
+    """Encode with orjson, or None if it is missing or rejects obj."""
+    if orjson is None:
+        return None
+    # Stringify int/float/bool/None keys the way json.dumps does
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, option=option)
+    except TypeError:
+        return None
@@ -1,10 +1,12 @@
 """Data models for the parallel hooks system."""
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, Union
+import time
+
+from . import jsonio
 
 
 class EventType(Enum):
@@ -27,11 +29,11 @@ class WorkerState(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Represents an event in the system."""
     t: EventType  # event type
-    ts: str  # ISO timestamp
+    ts: Union[int, str]  # ns since epoch (legacy logs: ISO string)
     w: Optional[str] = None  # worker ID
     task: Optional[str] = None  # task ID
     msg: Optional[str] = None  # message
@@ -40,8 +42,30 @@ class Event:
     error: Optional[Dict[str, Any]] = None  # error details
     artifacts: Optional[List[str]] = None  # list of artifacts
 
-    def to_json(self) -> str:
-        """Convert event to JSON string for events.jsonl."""
+    @property
+    def ts_iso(self) -> str:
+        """Timestamp as a local ISO string, formatted on demand."""
+        if isinstance(self.ts, str):
+            return self.ts
+        seconds, nanos = divmod(self.ts, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(
+            microsecond=nanos // 1000
+        ).isoformat()
+
+    @property
+    def artifact_paths(self) -> List[str]:
+        """Paths reported by an artifact event, path first then artifacts.
+
+        One ARTIFACT event can report many files through artifacts
+        instead of one event per file.
+        """
+        paths = [self.path] if self.path else []
+        if self.artifacts:
+            paths.extend(self.artifacts)
+        return paths
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert event to a dictionary, omitting unset optional fields."""
         data = {
             't': self.t.value if isinstance(self.t, EventType) else self.t,
             'ts': self.ts
@@ -61,15 +85,25 @@ class Event:
             data['error'] = self.error
         if self.artifacts is not None:
             data['artifacts'] = self.artifacts
-        return json.dumps(data, separators=(',', ':'))
+        return data
+
+    def to_json(self) -> str:
+        """Convert event to JSON string for events.jsonl."""
+        return jsonio.dumps(self.to_dict())
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'Event':
-        """Create an Event from a JSON string."""
-        data = json.loads(json_str)
+    def from_dict(cls, data: Dict[str, Any]) -> 'Event':
+        """Create an Event from a decoded JSON object.
+
+        Raises:
+            TypeError: If data is not a JSON object
+            ValueError: If the event type is unknown
+        """
+        if not isinstance(data, dict):
+            raise TypeError(f"event must be a JSON object, not {type(data).__name__}")
         return cls(
             t=EventType(data['t']) if 't' in data else EventType.START,
-            ts=data.get('ts', datetime.now().isoformat()),
+            ts=data.get('ts') or time.time_ns(),
             w=data.get('w'),
             task=data.get('task'),
             msg=data.get('msg'),
@@ -79,8 +113,13 @@ class Event:
             artifacts=data.get('artifacts')
         )
 
+    @classmethod
+    def from_json(cls, json_str: Union[str, bytes]) -> 'Event':
+        """Create an Event from a JSON string or UTF-8 encoded bytes."""
+        return cls.from_dict(jsonio.loads(json_str))
+
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a task to be executed."""
     id: str
@@ -91,11 +130,22 @@ class Task:
     worker_hint: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert task to dictionary."""
-        return asdict(self)
+        """Convert task to dictionary.
 
+        The dictionary is shallow: deps, inputs and outputs are the task's
+        own containers, not copies.
+        """
+        return {
+            'id': self.id,
+            'description': self.description,
+            'deps': self.deps,
+            'inputs': self.inputs,
+            'outputs': self.outputs,
+            'worker_hint': self.worker_hint
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Worker:
     """Represents a worker process."""
     id: str
@@ -109,14 +159,24 @@ class Worker:
     last_msg: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert worker to dictionary."""
-        data = asdict(self)
-        if isinstance(data.get('state'), WorkerState):
-            data['state'] = data['state'].value
-        return data
+        """Convert worker to dictionary (shallow; cmd is not copied)."""
+        return {
+            'id': self.id,
+            'task': self.task,
+            'cmd': self.cmd,
+            'state': (
+                self.state.value if isinstance(self.state, WorkerState)
+                else self.state
+            ),
+            'pid': self.pid,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
+            'progress': self.progress,
+            'last_msg': self.last_msg
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     """Represents an execution plan."""
     run_id: str
@@ -137,7 +197,7 @@ class Plan:
 
     def to_json(self) -> str:
         """Convert plan to JSON string."""
-        return json.dumps(self.to_dict(), indent=2)
+        return jsonio.dumps(self.to_dict(), indent=True)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Plan':
@@ -151,12 +211,12 @@ class Plan:
         )
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'Plan':
-        """Create a Plan from a JSON string."""
-        return cls.from_dict(json.loads(json_str))
+    def from_json(cls, json_str: Union[str, bytes]) -> 'Plan':
+        """Create a Plan from a JSON string or UTF-8 encoded bytes."""
+        return cls.from_dict(jsonio.loads(json_str))
 
 
-@dataclass
+@dataclass(slots=True)
 class Status:
     """Represents the current status of all workers."""
     run_id: str
@@ -165,33 +225,39 @@ class Status:
     merge_ready: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert status to dictionary."""
-        return asdict(self)
+        """Convert status to dictionary (shallow; lists are not copied)."""
+        return {
+            'run_id': self.run_id,
+            'workers': self.workers,
+            'blocked_on': self.blocked_on,
+            'merge_ready': self.merge_ready
+        }
 
     def to_compact_string(self) -> str:
         """Generate a compact status string for context injection."""
-        parts = [f"R{self.run_id} status —"]
-
-        for worker in self.workers:
-            w_id = worker['id']
-            state = worker.get('state', 'unknown')
-            pct = worker.get('percent', 0)
-            msg = worker.get('last_msg', '')
-
-            if state == 'done':
-                parts.append(f"{w_id} ✓ done")
-            elif state == 'error' or state == 'failed':
-                parts.append(f"{w_id} ✗ {state}")
-            elif state == 'waiting':
-                parts.append(f"{w_id} waiting")
-            else:
-                parts.append(f"{w_id} {pct}% {msg}")
-
         if self.merge_ready:
-            parts.append("merge: ready")
+            merge = "merge: ready"
         elif self.blocked_on:
-            parts.append(f"merge: blocked on {', '.join(self.blocked_on)}")
+            merge = f"merge: blocked on {', '.join(self.blocked_on)}"
         else:
-            parts.append("merge: pending")
+            merge = "merge: pending"
+
+        return " ; ".join([
+            f"R{self.run_id} status —",
+            *map(_fmt_worker, self.workers),
+            merge
+        ])
+
+
+def _fmt_worker(worker: Dict[str, Any]) -> str:
+    """Format one worker entry of Status.to_compact_string."""
+    w_id = worker['id']
+    state = worker.get('state', 'unknown')
 
-        return " ; ".join(parts)
\ No newline at end of file
+    if state == 'done':
+        return f"{w_id} ✓ done"
+    if state == 'error' or state == 'failed':
+        return f"{w_id} ✗ {state}"
+    if state == 'waiting':
+        return f"{w_id} waiting"
+    return f"{w_id} {worker.get('percent', 0)}% {worker.get('last_msg', '')}"
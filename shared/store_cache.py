@@ -0,0 +1,52 @@
+"""Process-wide cache of EventStoreV2 instances keyed by database path."""
+
+import atexit
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Tuple, Union
+
+if TYPE_CHECKING:
+    from .event_store_v2 import EventStoreV2
+
+_stores: Dict[Tuple[Path, bool], 'EventStoreV2'] = {}
+
+
+def get_store(db_path: Union[str, Path], read_only: bool = False) -> 'EventStoreV2':
+    """Get a shared event store for a database path.
+
+    The first call for a path creates the store; later calls reuse it.
+    The database is opened, and its schema created, on first use.
+    Connections stay thread-local inside the store. Cached stores are
+    meant for short-lived hook processes, so they never checkpoint the
+    WAL themselves; SQLite's autocheckpoint keeps it bounded.
+
+    Hooks that only query state should pass read_only=True: read-only
+    stores skip schema creation and never take the write lock. They are
+    cached separately from writable stores for the same path.
+
+    Args:
+        db_path: Path to SQLite database file
+        read_only: Open the store's connections read-only
+
+    Returns:
+        Cached event store for the resolved path and mode
+    """
+    path = Path(db_path).resolve()
+    key = (path, read_only)
+    store = _stores.get(key)
+    if store is None:
+        # Imported here so hooks without an active run never load sqlite3
+        from .event_store_v2 import EventStoreV2
+        store = _stores[key] = EventStoreV2(
+            str(path), read_only=read_only, checkpoint_interval=None
+        )
+    return store
+
+
+def close_stores() -> None:
+    """Close and forget all cached stores."""
+    while _stores:
+        _, store = _stores.popitem()
+        store.close()
+
+
+atexit.register(close_stores)
@@ -1,11 +1,29 @@
 """Utility functions for the parallel hooks system."""
 
 import os
-import uuid
+import base64
+import sys
+import json
+import time
+import functools
 import platform
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, List, Optional
+
+from . import jsonio
+
+# Name of the pointer file recording the active run inside the runs directory
+ACTIVE_POINTER_NAME = 'ACTIVE'
+
+# Seconds after which an untouched ACTIVE pointer is considered stale
+ACTIVE_RUN_MAX_AGE = 12 * 60 * 60
+
+# Sentinel marking the current run ID as not yet read from disk
+_UNSET = object()
+
+# Run ID read from current_run.txt, cached for the life of the process
+_RUN_ID = _UNSET
 
 
 def generate_run_id() -> str:
@@ -14,14 +32,16 @@ def generate_run_id() -> str:
     Returns:
         A short, unique run ID (e.g., R42a3)
     """
-    # Use last 4 chars of UUID for brevity
-    short_id = str(uuid.uuid4())[-4:]
-    return f"R{short_id}"
+    # 20 random bits as 4 lowercase base32 characters
+    return "R" + base64.b32encode(os.urandom(3)).decode()[:4].lower()
 
 
+@functools.lru_cache(maxsize=1)
 def get_claude_base_directory() -> Path:
     """Get the base Claude directory.
 
+    Cached for the life of the process, like get_runs_directory.
+
     Returns:
         Path to .claude directory
     """
@@ -33,6 +53,19 @@ def get_claude_base_directory() -> Path:
     return Path.cwd() / '.claude'
 
 
+@functools.lru_cache(maxsize=1)
+def get_runs_directory() -> Path:
+    """Get the directory holding all run directories.
+
+    Cached for the life of the process; hooks consult it on every call.
+
+    Returns:
+        Path to the runs directory
+    """
+    return get_claude_base_directory() / 'runs'
+
+
+@functools.lru_cache(maxsize=64)
 def get_run_directory(run_id: str) -> Path:
     """Get the directory for a specific run.
 
@@ -42,8 +75,79 @@ def get_run_directory(run_id: str) -> Path:
     Returns:
         Path to the run directory
     """
-    base = get_claude_base_directory()
-    return base / 'runs' / run_id
+    return get_runs_directory() / run_id
+
+
+def has_active_run() -> bool:
+    """Check for a fresh ACTIVE pointer with a single stat call.
+
+    Hooks use this as an early exit so sessions without a parallel run
+    skip all database work.
+
+    Returns:
+        True if an ACTIVE pointer exists and is not stale
+    """
+    try:
+        mtime = (get_runs_directory() / ACTIVE_POINTER_NAME).stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return time.time() - mtime <= ACTIVE_RUN_MAX_AGE
+
+
+def get_active_run_id() -> Optional[str]:
+    """Get the ID of the active run.
+
+    Reads the ACTIVE pointer file written by set_active_run_id. A pointer
+    older than ACTIVE_RUN_MAX_AGE is treated as left over from a finished
+    session and ignored. Falls back to the most recently modified run
+    directory when no pointer has been written.
+
+    Returns:
+        Active run ID or None if there are no runs
+    """
+    pointer = get_runs_directory() / ACTIVE_POINTER_NAME
+    try:
+        if time.time() - pointer.stat().st_mtime > ACTIVE_RUN_MAX_AGE:
+            return None
+        return pointer.read_text().strip() or None
+    except FileNotFoundError:
+        pass
+
+    # DirEntry caches the file type and stat result, so each run
+    # directory costs one stat call instead of several
+    best = None
+    best_mtime = -1.0
+    try:
+        with os.scandir(get_runs_directory()) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best, best_mtime = entry.name, mtime
+    except FileNotFoundError:
+        return None
+    return best
+
+
+def set_active_run_id(run_id: str) -> None:
+    """Atomically point the ACTIVE file at a run.
+
+    Args:
+        run_id: Run ID to mark as active
+    """
+    runs_dir = ensure_directory(get_runs_directory())
+    tmp_path = runs_dir / f".{ACTIVE_POINTER_NAME}.{os.getpid()}.tmp"
+    tmp_path.write_text(run_id)
+    os.replace(tmp_path, runs_dir / ACTIVE_POINTER_NAME)
+
+
+def clear_active_run_id() -> None:
+    """Remove the ACTIVE pointer file."""
+    try:
+        (get_runs_directory() / ACTIVE_POINTER_NAME).unlink()
+    except FileNotFoundError:
+        pass
 
 
 def ensure_directory(path: Path) -> Path:
@@ -60,22 +164,55 @@ def ensure_directory(path: Path) -> Path:
     return path
 
 
+def ensure_directories(paths: Iterable[Path]) -> List[Path]:
+    """Ensure several directories exist, with one mkdir call each.
+
+    For orchestrators preparing all worker directories up front instead
+    of each worker creating its own. Paths are created shallowest first,
+    so directories sharing a parent need no further parent checks.
+
+    Args:
+        paths: Paths to create if they don't exist
+
+    Returns:
+        The distinct paths that were created/verified
+    """
+    unique = sorted({Path(p) for p in paths}, key=lambda p: len(p.parts))
+    for path in unique:
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            if not path.is_dir():
+                raise
+        except FileNotFoundError:
+            path.mkdir(parents=True, exist_ok=True)
+    return unique
+
+
 def get_current_run_id() -> Optional[str]:
     """Get the current run ID from environment or state file.
 
+    The state file is read at most once per process; set_current_run_id
+    and clear_current_run_id keep the cached value in sync.
+
     Returns:
         Current run ID or None if not in a run
     """
+    global _RUN_ID
+
     # Check environment variable first
     if 'CLAUDE_RUN_ID' in os.environ:
         return os.environ['CLAUDE_RUN_ID']
 
     # Check for state file
-    state_file = get_claude_base_directory() / 'current_run.txt'
-    if state_file.exists():
-        return state_file.read_text().strip()
+    if _RUN_ID is _UNSET:
+        state_file = get_claude_base_directory() / 'current_run.txt'
+        try:
+            _RUN_ID = state_file.read_text().strip()
+        except FileNotFoundError:
+            _RUN_ID = None
 
-    return None
+    return _RUN_ID
 
 
 def set_current_run_id(run_id: str) -> None:
@@ -84,16 +221,24 @@ def set_current_run_id(run_id: str) -> None:
     Args:
         run_id: Run ID to set as current
     """
+    global _RUN_ID
+
     state_file = get_claude_base_directory() / 'current_run.txt'
     ensure_directory(state_file.parent)
     state_file.write_text(run_id)
+    _RUN_ID = run_id
 
 
 def clear_current_run_id() -> None:
     """Clear the current run ID."""
+    global _RUN_ID
+
     state_file = get_claude_base_directory() / 'current_run.txt'
-    if state_file.exists():
+    try:
         state_file.unlink()
+    except FileNotFoundError:
+        pass
+    _RUN_ID = None
 
 
 def is_windows() -> bool:
@@ -111,7 +256,6 @@ def get_python_executable() -> str:
     Returns:
         Path to python executable
     """
-    import sys
     return sys.executable
 
 
@@ -153,19 +297,26 @@ def parse_json_input() -> dict:
     Returns:
         Parsed JSON data from stdin
     """
-    import sys
-    import json
-
-    input_data = sys.stdin.read()
-    if not input_data:
-        return {}
-
+    # Empty input raises JSONDecodeError as well; the raw bytes go
+    # straight to the decoder, skipping a separate text decode
     try:
-        return json.loads(input_data)
+        return jsonio.loads(sys.stdin.buffer.read())
     except json.JSONDecodeError:
         return {}
 
 
+def read_raw_input() -> bytes:
+    """Read stdin as raw bytes without decoding or parsing.
+
+    For hooks that forward their input straight to
+    EventStoreV2.append_event_raw and only parse it when needed.
+
+    Returns:
+        Raw bytes from stdin
+    """
+    return sys.stdin.buffer.read()
+
+
 def output_json(data: dict, exit_code: int = 0) -> None:
     """Output JSON to stdout and exit with specified code.
 
@@ -173,10 +324,8 @@ def output_json(data: dict, exit_code: int = 0) -> None:
         data: Data to output as JSON
         exit_code: Exit code (0=success, 2=block)
     """
-    import sys
-    import json
-
-    print(json.dumps(data, indent=2))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(jsonio.dumps_bytes(data, indent=True) + b'\n')
     sys.exit(exit_code)
 
 
@@ -187,12 +336,21 @@ def output_text(text: str, exit_code: int = 0) -> None:
         text: Text to output
         exit_code: Exit code
     """
-    import sys
-
     print(text)
     sys.exit(exit_code)
 
 
+def output_lines(lines: List[str], exit_code: int = 0) -> None:
+    """Output several lines to stdout in a single write and exit.
+
+    Args:
+        lines: Lines to output, without trailing newlines
+        exit_code: Exit code
+    """
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.exit(exit_code)
+
+
 def output_error(error: str, exit_code: int = 2) -> None:
     """Output error to stderr and exit.
 
@@ -200,7 +358,5 @@ def output_error(error: str, exit_code: int = 2) -> None:
         error: Error message
         exit_code: Exit code (default 2 for blocking)
     """
-    import sys
-
     print(error, file=sys.stderr)
     sys.exit(exit_code)
\ No newline at end of file
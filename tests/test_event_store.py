@@ -0,0 +1,99 @@
+"""Tests for the JSONL event store."""
+
+from shared.event_store import EventStore
+from shared.models import Event, EventType
+
+
+def test_artifact_index_backfilled_for_pre_index_log(tmp_path):
+    old = Event(EventType.ARTIFACT, 1, w='W1', path='old.txt')
+    (tmp_path / 'events.jsonl').write_text(old.to_json() + '\n')
+
+    store = EventStore(str(tmp_path))
+    store.append_event(Event(EventType.ARTIFACT, 0, w='W1', path='n1.txt'))
+    store.append_event(Event(EventType.ARTIFACT, 0, w='W1', path='n2.txt'))
+    store.close()
+
+    expected = ['old.txt', 'n1.txt', 'n2.txt']
+    assert store.get_worker_artifacts('W1') == expected
+    assert EventStore(str(tmp_path)).get_worker_artifacts('W1') == expected
+
+
+
+def test_artifact_index_backfill_skips_invalid_lines(tmp_path):
+    lines = [
+        '[1]',
+        '{"t": "bogus"}',
+        Event(EventType.ARTIFACT, 1, w='W1', path='old.txt').to_json(),
+    ]
+    (tmp_path / 'events.jsonl').write_text('\n'.join(lines) + '\n')
+
+    store = EventStore(str(tmp_path))
+    store.append_event(Event(EventType.ARTIFACT, 0, w='W1', path='new.txt'))
+    store.close()
+
+    assert (tmp_path / 'artifacts.idx').exists()
+    assert store.get_worker_artifacts('W1') == ['old.txt', 'new.txt']
+
+def test_invalid_event_lines_are_skipped(tmp_path):
+    lines = [
+        Event(EventType.START, 1, w='W1').to_json(),
+        '{"t": "bogus", "ts": 2}',
+        '{"t": "done", "ts"',
+        '[1]',
+        Event(EventType.DONE, 3, w='W1').to_json(),
+    ]
+    (tmp_path / 'events.jsonl').write_text('\n'.join(lines) + '\n')
+
+    store = EventStore(str(tmp_path))
+    expected = [EventType.START, EventType.DONE]
+    assert [e.t for e in store.read_events()] == expected
+    assert [e.t for e in store.tail_events(10)] == expected
+    assert [e.t for e in store.stream_events()] == expected
+    store.close()
+
+
+def test_tail_events_block_boundary_on_newline(tmp_path, monkeypatch):
+    # With equal-length lines, a block one byte longer than a line starts
+    # on the newline ending the previous line, so the first segment read
+    # is empty
+    events = [Event(EventType.PROGRESS, 1, w='W1', pct=10 + i) for i in range(36)]
+    line_size = len(events[0].to_json()) + 1
+    monkeypatch.setattr('shared.event_store.TAIL_BLOCK_SIZE', line_size + 1)
+
+    store = EventStore(str(tmp_path))
+    for event in events:
+        store.append_event(event)
+    assert (tmp_path / 'events.jsonl').stat().st_size == 36 * line_size
+
+    for n in (1, 2, 5, 36, 50):
+        expected = [10 + i for i in range(36)][-n:]
+        assert [e.pct for e in store.tail_events(n)] == expected
+    store.close()
+
+
+def test_status_and_completion_round_trip(tmp_path):
+    store = EventStore(str(tmp_path))
+    store.append_event(Event(EventType.START, 1, w='W1', task='T1'))
+    store.append_event(Event(EventType.DONE, 2, w='W1', task='T1'))
+
+    status = store.compute_status()
+    store.save_status(status)
+    assert store.load_status() == status
+
+    store.mark_complete(status)
+    assert store.load_completion() == {'done': 1}
+    store.close()
+
+
+def test_tail_events_ignores_blank_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr('shared.event_store.TAIL_BLOCK_SIZE', 16)
+    lines = []
+    for i in range(20):
+        lines.append(Event(EventType.PROGRESS, 1, w='W1', pct=i).to_json())
+        lines.extend([''] * (i % 4))
+    (tmp_path / 'events.jsonl').write_text('\n'.join(lines) + '\n\n\n')
+
+    store = EventStore(str(tmp_path))
+    for n in (1, 3, 7, 20, 25):
+        assert [e.pct for e in store.tail_events(n)] == list(range(20))[-n:]
+    store.close()
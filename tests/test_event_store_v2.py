@@ -0,0 +1,284 @@
+"""Tests for the SQLite event store."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from shared.event_store_v2 import EventStoreV2, EventType, WorkerState
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStoreV2(str(tmp_path / 'state.db'), checkpoint_interval=None)
+    yield store
+    store.close()
+
+
+def test_enqueue_event_flush_commits_all(store):
+    for i in range(60):
+        store.enqueue_event(EventType.PROGRESS, 'R1', 'W1', payload={'i': i})
+    store.flush()
+
+    events = store.get_events('R1', limit=100)
+    assert len(events) == 60
+
+
+def test_close_drains_queued_events(tmp_path):
+    db_path = str(tmp_path / 'state.db')
+    store = EventStoreV2(db_path, checkpoint_interval=None)
+    for _ in range(30):
+        store.enqueue_event(EventType.DONE, 'R1', 'W1')
+    store.close()
+
+    reader = EventStoreV2(db_path, read_only=True)
+    try:
+        assert len(reader.get_events('R1', limit=100)) == 30
+    finally:
+        reader.close()
+
+
+def test_enqueue_event_rejects_bad_payload_in_caller(store):
+    for _ in range(10):
+        store.enqueue_event(EventType.DONE, 'R1', 'W1')
+    with pytest.raises(TypeError):
+        store.enqueue_event(EventType.DONE, 'R1', 'W1', payload={'x': object()})
+    for _ in range(10):
+        store.enqueue_event(EventType.DONE, 'R1', 'W1')
+    store.flush()
+
+    assert len(store.get_events('R1', limit=100)) == 20
+
+
+def test_flush_raises_background_error_once(store):
+    # run_id is NOT NULL, so the batch fails inside the flusher thread
+    store.enqueue_event(EventType.DONE, None)
+    with pytest.raises(sqlite3.IntegrityError):
+        store.flush()
+    store.flush()
+
+
+def test_legacy_text_times_migrated(tmp_path):
+    db_path = str(tmp_path / 'state.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE workers (
+            id TEXT PRIMARY KEY, run_id TEXT NOT NULL, task_id TEXT,
+            state TEXT NOT NULL DEFAULT 'idle', pid INTEGER, started_at TEXT,
+            last_heartbeat TEXT, progress INTEGER DEFAULT 0, last_message TEXT
+        );
+        CREATE INDEX idx_workers_state ON workers(state);
+        CREATE INDEX idx_workers_run_id ON workers(run_id);
+        CREATE TABLE blocks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, worker_id TEXT NOT NULL,
+            hook_event TEXT NOT NULL, created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            expires_at TEXT NOT NULL, reason TEXT,
+            retry_count INTEGER DEFAULT 0, max_retries INTEGER DEFAULT 3
+        );
+        CREATE INDEX idx_blocks_expires ON blocks(expires_at);
+        INSERT INTO workers (id, run_id, state, last_heartbeat)
+        VALUES ('W1', 'R1', 'busy', '2020-01-01 00:00:00');
+    """)
+    # Old create_block bound a local datetime, stored as ISO text
+    expires = datetime.now() + timedelta(hours=1)
+    conn.execute(
+        "INSERT INTO blocks (worker_id, hook_event, expires_at) VALUES (?, ?, ?)",
+        ('W1', 'Stop', expires.isoformat(' '))
+    )
+    conn.commit()
+    conn.close()
+
+    store = EventStoreV2(db_path, checkpoint_interval=None)
+    try:
+        assert store.get_worker_status('W1')['last_heartbeat'] == 1577836800
+        assert [w['id'] for w in store.detect_dead_workers()] == ['W1']
+
+        blocks = store.get_active_blocks('Stop', cleanup=True)
+        assert len(blocks) == 1
+        assert blocks[0]['expires_at'] == int(expires.timestamp())
+
+        tables = {
+            row[0] for row in store.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        assert not {'workers_legacy', 'blocks_legacy'} & tables
+    finally:
+        store.close()
+
+
+def test_append_events_batch_stores_percent_and_message(store):
+    store.append_events_batch([
+        (EventType.START, 'R1', 'W1', 'T1', None),
+        (EventType.PROGRESS, 'R1', 'W1', 'T1', None, 40, 'halfway'),
+    ])
+
+    events = store.get_events('R1')
+    assert [(e['event_type'], e['percent'], e['message']) for e in events] == [
+        ('progress', 40, 'halfway'),
+        ('start', None, None),
+    ]
+
+
+def test_enqueue_event_stores_percent_and_message(store):
+    store.enqueue_event(
+        EventType.PROGRESS, 'R1', 'W1', percent=75, message='almost'
+    )
+    store.flush()
+
+    event, = store.get_events('R1')
+    assert (event['percent'], event['message']) == (75, 'almost')
+
+
+def test_enqueue_event_during_close_does_not_hang(tmp_path):
+    db_path = str(tmp_path / 'state.db')
+    store = EventStoreV2(db_path, checkpoint_interval=None)
+    store.enqueue_event(EventType.START, 'R1', 'W1')
+    stop = threading.Event()
+
+    def produce():
+        while not stop.is_set():
+            store.enqueue_event(EventType.PROGRESS, 'R1', 'W1')
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    closer = threading.Thread(target=store.close, daemon=True)
+    closer.start()
+    closer.join(timeout=10)
+    stop.set()
+    producer.join()
+    assert not closer.is_alive()
+
+    # Events enqueued after close() are committed directly
+    store.enqueue_event(EventType.DONE, 'R1', 'W1')
+    assert store._flusher_thread is None
+    reader = EventStoreV2(db_path, read_only=True)
+    try:
+        assert reader.get_events('R1', event_type=EventType.DONE)
+    finally:
+        reader.close()
+        store.close()
+
+
+def test_aexecute_runs_calls_on_writer_thread(store):
+    async def main():
+        event_ids = await asyncio.gather(*(
+            store.aexecute(store.append_event, EventType.PROGRESS, 'R1', 'W1')
+            for _ in range(5)
+        ))
+        thread_name = await store.aexecute(
+            lambda: threading.current_thread().name
+        )
+        return event_ids, thread_name
+
+    event_ids, thread_name = asyncio.run(main())
+    assert event_ids == sorted(event_ids) and len(set(event_ids)) == 5
+    assert thread_name.startswith('EventStoreV2-writer')
+
+
+def test_aexecute_propagates_exceptions(store):
+    async def main():
+        # run_id is NOT NULL
+        with pytest.raises(sqlite3.IntegrityError):
+            await store.aexecute(store.append_event, EventType.DONE, None)
+        return await store.aexecute(store.append_event, EventType.DONE, 'R1')
+
+    assert asyncio.run(main())
+
+
+def test_close_waits_for_queued_aexecute_calls(tmp_path):
+    db_path = str(tmp_path / 'state.db')
+    store = EventStoreV2(db_path, checkpoint_interval=None)
+
+    async def main():
+        tasks = [
+            asyncio.ensure_future(
+                store.aexecute(store.append_event, EventType.PROGRESS, 'R1')
+            )
+            for _ in range(20)
+        ]
+        # Let every task queue its call before closing
+        await asyncio.sleep(0)
+        await asyncio.get_running_loop().run_in_executor(None, store.close)
+        assert store._writer_thread is None
+        await asyncio.gather(*tasks)
+        # After close() calls run directly on the calling thread
+        return await store.aexecute(threading.current_thread)
+
+    assert asyncio.run(main()) is threading.main_thread()
+    reader = EventStoreV2(db_path, read_only=True)
+    try:
+        assert len(reader.get_events('R1')) == 20
+    finally:
+        reader.close()
+        store.close()
+
+
+def test_finalize_worker_success(store):
+    store.update_worker_status('W1', 'R1', WorkerState.BUSY, 50, 'T1')
+    store.finalize_worker(
+        'W1', 'R1', 'T1', artifacts=['a.txt', 'b.txt'], message='finished'
+    )
+
+    worker = store.get_worker_status('W1')
+    assert (worker['state'], worker['progress'], worker['task_id']) == ('done', 100, 'T1')
+    assert worker['last_message'] == 'finished'
+
+    events = store.get_events('R1')[::-1]
+    assert [(e['event_type'], e['task_id']) for e in events] == [
+        ('artifact', 'T1'), ('artifact', 'T1'), ('done', 'T1'),
+    ]
+    assert [json.loads(e['payload']) for e in events[:2]] == [
+        {'path': 'a.txt'}, {'path': 'b.txt'},
+    ]
+    assert sorted(store.get_ready_artifacts_for_run('R1')) == ['a.txt', 'b.txt']
+
+
+def test_finalize_worker_failure(store):
+    store.update_worker_status('W1', 'R1', WorkerState.BUSY, 50, 'T1')
+    store.finalize_worker('W1', 'R1', 'T1', success=False, error='boom')
+
+    worker = store.get_worker_status('W1')
+    assert (worker['state'], worker['progress']) == ('error', 50)
+
+    event, = store.get_events('R1')
+    assert event['event_type'] == 'error'
+    assert json.loads(event['payload']) == {'error': 'boom'}
+    assert store.get_ready_artifacts_for_run('R1') == []
+
+
+def test_append_event_and_update_status(store):
+    event_id = store.append_event_and_update_status(
+        EventType.PROGRESS, 'R1', 'W1', 'T1',
+        state=WorkerState.BUSY, progress=30, message='parsing'
+    )
+
+    event, = store.get_events('R1')
+    assert event['id'] == event_id
+    assert (event['event_type'], event['worker_id'], event['task_id']) == (
+        'progress', 'W1', 'T1'
+    )
+    assert (event['percent'], event['message']) == (30, 'parsing')
+
+    worker = store.get_worker_status('W1')
+    assert (worker['state'], worker['progress'], worker['task_id']) == ('busy', 30, 'T1')
+    assert worker['last_message'] == 'parsing'
+
+
+def test_touch_heartbeat(store, monkeypatch):
+    assert not store.touch_heartbeat('W1')
+
+    monkeypatch.setattr(time, 'time', lambda: 1000)
+    store.update_worker_status('W1', 'R1', WorkerState.BUSY)
+    monkeypatch.setattr(time, 'time', lambda: 2000)
+    assert not store.touch_heartbeat('W1', min_interval=60)
+    assert store.get_worker_status('W1')['last_heartbeat'] == 1000
+
+    assert store.touch_heartbeat('W1')
+    worker = store.get_worker_status('W1')
+    assert (worker['last_heartbeat'], worker['state']) == (2000, 'busy')
+    assert store.get_events('R1') == []
@@ -0,0 +1,20 @@
+"""Tests for the data models' JSON encoding."""
+
+import json
+
+from shared import jsonio
+from shared.models import Event, EventType, Plan, Task
+
+
+def test_event_to_json_non_str_keys_and_big_ints():
+    event = Event(EventType.ERROR, 1, error={3: 4, 'big': 2 ** 70})
+    assert json.loads(event.to_json()) == {
+        't': 'error', 'ts': 1, 'error': {'3': 4, 'big': 2 ** 70}
+    }
+
+
+def test_plan_to_json_matches_stdlib_fallback(monkeypatch):
+    plan = Plan('R1', 'now', 'p', [Task('t', 'd', inputs={1: 'a'})], [])
+    encoded = json.loads(plan.to_json())
+    monkeypatch.setattr(jsonio, 'orjson', None)
+    assert json.loads(plan.to_json()) == encoded
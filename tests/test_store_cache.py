@@ -0,0 +1,20 @@
+"""Tests for the process-wide event store cache."""
+
+from shared.event_store_v2 import EventType
+from shared.store_cache import close_stores, get_store
+
+
+def test_get_store_caches_by_path_and_mode(tmp_path):
+    db_path = tmp_path / 'state.db'
+    try:
+        writer = get_store(db_path)
+        writer.append_event(EventType.DONE, 'R1', 'W1')
+
+        reader = get_store(str(db_path), read_only=True)
+        assert reader is not writer
+        assert reader.read_only and not writer.read_only
+        assert get_store(db_path) is writer
+        assert get_store(db_path, read_only=True) is reader
+        assert len(reader.get_events('R1')) == 1
+    finally:
+        close_stores()
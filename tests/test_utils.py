@@ -0,0 +1,14 @@
+"""Tests for the hook I/O helpers."""
+
+import json
+
+import pytest
+
+from shared.utils import output_json
+
+
+def test_output_json_non_str_keys_keeps_exit_code(capsysbinary):
+    with pytest.raises(SystemExit) as exc:
+        output_json({'a': 'é', 3: 4}, 2)
+    assert exc.value.code == 2
+    assert json.loads(capsysbinary.readouterr().out) == {'a': 'é', '3': 4}